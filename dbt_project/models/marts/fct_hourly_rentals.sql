@@ -28,5 +28,6 @@ SELECT
         WHEN hour BETWEEN 16 AND 19 THEN 'Evening Rush'
         WHEN hour BETWEEN 20 AND 23 THEN 'Night'
         ELSE 'Early Morning'
-    END as time_of_day
+    END as time_of_day,
+    loaded_at
 FROM {{ ref('stg_bikeshare') }} 
\ No newline at end of file
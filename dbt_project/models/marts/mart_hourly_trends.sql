@@ -0,0 +1,11 @@
+SELECT
+    day_name,
+    hour,
+    time_of_day,
+    COUNT(*) as total_hours,
+    AVG(total_rentals) as avg_rentals,
+    AVG(casual_users) as avg_casual_users,
+    AVG(registered_users) as avg_registered_users,
+    SUM(total_rentals) as total_rentals
+FROM {{ ref('fct_hourly_rentals') }}
+GROUP BY day_name, hour, time_of_day
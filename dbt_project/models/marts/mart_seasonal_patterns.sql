@@ -0,0 +1,8 @@
+SELECT
+    season_name,
+    EXTRACT(MONTH FROM date) as month,
+    EXTRACT(YEAR FROM date) as year,
+    AVG(total_rentals) as avg_rentals,
+    COUNT(*) as total_hours
+FROM {{ ref('fct_hourly_rentals') }}
+GROUP BY season_name, EXTRACT(MONTH FROM date), EXTRACT(YEAR FROM date)
@@ -0,0 +1,10 @@
+SELECT
+    day_name,
+    hour,
+    time_of_day,
+    SUM(casual_users) as casual_users,
+    SUM(registered_users) as registered_users,
+    SUM(total_rentals) as total_rentals,
+    ROUND(SUM(casual_users) * 100.0 / NULLIF(SUM(total_rentals), 0), 2) as casual_percentage
+FROM {{ ref('fct_hourly_rentals') }}
+GROUP BY day_name, hour, time_of_day
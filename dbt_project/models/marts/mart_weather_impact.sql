@@ -0,0 +1,12 @@
+SELECT
+    w.weather_desc,
+    w.avg_temp_celsius,
+    w.avg_humidity_percent,
+    w.avg_windspeed_kmh,
+    COUNT(f.record_id) as total_hours,
+    AVG(f.total_rentals) as avg_rentals,
+    SUM(f.total_rentals) as total_rentals
+FROM {{ ref('fct_hourly_rentals') }} f
+JOIN {{ ref('dim_weather') }} w ON f.weather_id = w.weather_id
+GROUP BY w.weather_id, w.weather_desc, w.avg_temp_celsius,
+         w.avg_humidity_percent, w.avg_windspeed_kmh
@@ -0,0 +1,111 @@
+WITH record_counts AS (
+    SELECT
+        'record_counts' as section,
+        1 as section_order,
+        ARRAY_CONSTRUCT(OBJECT_CONSTRUCT(
+            'raw_records', (SELECT COUNT(*) FROM {{ source('raw', 'bikeshare_raw') }}),
+            'weather_records', (SELECT COUNT(*) FROM {{ ref('dim_weather') }}),
+            'fact_records', (SELECT COUNT(*) FROM {{ ref('fct_hourly_rentals') }})
+        )) as payload
+),
+
+weather_conditions AS (
+    SELECT
+        'weather_conditions' as section,
+        2 as section_order,
+        ARRAY_AGG(OBJECT_CONSTRUCT(
+            'weather_id', weather_id,
+            'weather_desc', weather_desc,
+            'avg_temp', ROUND(avg_temp_celsius, 2),
+            'avg_humidity', ROUND(avg_humidity_percent, 1)
+        )) WITHIN GROUP (ORDER BY weather_id) as payload
+    FROM {{ ref('dim_weather') }}
+),
+
+busiest_hours AS (
+    SELECT
+        'busiest_hours' as section,
+        3 as section_order,
+        ARRAY_AGG(OBJECT_CONSTRUCT(
+            'date', date,
+            'hour', hour,
+            'season_name', season_name,
+            'time_of_day', time_of_day,
+            'total_rentals', total_rentals
+        )) WITHIN GROUP (ORDER BY total_rentals DESC) as payload
+    FROM (
+        SELECT date, hour, season_name, time_of_day, total_rentals
+        FROM {{ ref('fct_hourly_rentals') }}
+        ORDER BY total_rentals DESC
+        LIMIT 10
+    )
+),
+
+seasonal_patterns AS (
+    SELECT
+        'seasonal_patterns' as section,
+        4 as section_order,
+        ARRAY_AGG(OBJECT_CONSTRUCT(
+            'season_name', season_name,
+            'total_hours', total_hours,
+            'avg_rentals', avg_rentals,
+            'total_rentals', total_rentals
+        )) WITHIN GROUP (ORDER BY avg_rentals DESC) as payload
+    FROM (
+        SELECT
+            season_name,
+            COUNT(*) as total_hours,
+            AVG(total_rentals) as avg_rentals,
+            SUM(total_rentals) as total_rentals
+        FROM {{ ref('fct_hourly_rentals') }}
+        GROUP BY season_name
+    )
+),
+
+weather_impact AS (
+    SELECT
+        'weather_impact' as section,
+        5 as section_order,
+        ARRAY_AGG(OBJECT_CONSTRUCT(
+            'weather_desc', weather_desc,
+            'hours', hours,
+            'avg_rentals', avg_rentals
+        )) WITHIN GROUP (ORDER BY avg_rentals DESC) as payload
+    FROM (
+        SELECT
+            ANY_VALUE(w.weather_desc) as weather_desc,
+            COUNT(*) as hours,
+            AVG(f.total_rentals) as avg_rentals
+        FROM {{ ref('fct_hourly_rentals') }} f
+        JOIN {{ ref('dim_weather') }} w ON f.weather_id = w.weather_id
+        GROUP BY w.weather_id
+    )
+),
+
+peak_hours AS (
+    SELECT
+        'peak_hours' as section,
+        6 as section_order,
+        ARRAY_AGG(OBJECT_CONSTRUCT(
+            'hour', hour,
+            'time_of_day', time_of_day,
+            'avg_rentals', avg_rentals
+        )) WITHIN GROUP (ORDER BY avg_rentals DESC) as payload
+    FROM (
+        SELECT
+            hour,
+            AVG(total_rentals) as avg_rentals,
+            ANY_VALUE(time_of_day) as time_of_day
+        FROM {{ ref('fct_hourly_rentals') }}
+        GROUP BY hour
+        ORDER BY avg_rentals DESC
+        LIMIT 8
+    )
+)
+
+SELECT * FROM record_counts
+UNION ALL SELECT * FROM weather_conditions
+UNION ALL SELECT * FROM busiest_hours
+UNION ALL SELECT * FROM seasonal_patterns
+UNION ALL SELECT * FROM weather_impact
+UNION ALL SELECT * FROM peak_hours
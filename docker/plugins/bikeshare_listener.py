@@ -0,0 +1,62 @@
+import logging
+import os
+import threading
+import requests
+from airflow.listeners import hookimpl
+from airflow.plugins_manager import AirflowPlugin
+from prometheus_client import start_http_server, Counter
+
+logger = logging.getLogger(__name__)
+
+# DAG run outcomes are pushed by the scheduler as they happen instead of being polled from the metadata DB
+pipeline_success = Counter('pipeline_success_total', 'Successful pipeline runs', ['dag_id'])
+pipeline_failure = Counter('pipeline_failure_total', 'Failed pipeline runs', ['dag_id'])
+
+METRICS_PORT = 8001
+
+
+class DagRunMetricsListener:
+    """Counts DAG run outcomes into Prometheus."""
+
+    @hookimpl
+    def on_starting(self, component):
+        """Expose the counters from the scheduler process."""
+        # on_starting fires for every job process (including LocalExecutor task runners);
+        # only the scheduler emits DAG run events, so only it binds the port
+        if getattr(component, 'job_type', None) != 'SchedulerJob':
+            return
+        try:
+            start_http_server(METRICS_PORT)
+            logger.info(f"✅ DAG run metrics server started on port {METRICS_PORT}")
+        except OSError as e:
+            logger.error(f"❌ Could not start DAG run metrics server on port {METRICS_PORT}: {e}")
+
+    @hookimpl
+    def on_dag_run_success(self, dag_run, msg):
+        pipeline_success.labels(dag_run.dag_id).inc()
+
+    @hookimpl
+    def on_dag_run_failed(self, dag_run, msg):
+        pipeline_failure.labels(dag_run.dag_id).inc()
+        message = f"❌ DAG {dag_run.dag_id} failed at {dag_run.start_date}"
+        logger.error(message)
+
+        # Post from a daemon thread so a slow webhook never stalls the scheduler loop
+        webhook = os.getenv('SLACK_WEBHOOK_URL', '')
+        if webhook:
+            threading.Thread(target=_send_slack_alert, args=(webhook, message), daemon=True).start()
+
+
+def _send_slack_alert(webhook, message):
+    """Post a DAG failure alert to Slack."""
+    try:
+        response = requests.post(webhook, json={'text': message}, timeout=10)
+        response.raise_for_status()
+        logger.info("✅ Slack alert sent successfully")
+    except Exception as e:
+        logger.error(f"❌ Failed to send Slack alert: {e}")
+
+
+class BikeshareListenerPlugin(AirflowPlugin):
+    name = 'bikeshare_listener'
+    listeners = [DagRunMetricsListener()]
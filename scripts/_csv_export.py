@@ -0,0 +1,13 @@
+import pyarrow as pa
+import pyarrow.csv as pv
+
+def write_csv(df, path, index=False):
+    """Write a DataFrame to CSV using pyarrow's multithreaded C++ writer."""
+    table = pa.Table.from_pandas(df.reset_index() if index else df, preserve_index=False)
+
+    # The CSV writer has no dictionary support, so decode categoricals back to plain values
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+
+    pv.write_csv(table, path, write_options=pv.WriteOptions(include_header=True))
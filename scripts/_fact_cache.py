@@ -0,0 +1,45 @@
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CACHE_PATH = '/tmp/fct_hourly_rentals.parquet'
+
+FACT_SQL = """
+    SELECT
+        f.date,
+        f.hour,
+        f.day_name,
+        f.season_name,
+        f.time_of_day,
+        f.casual_users,
+        f.registered_users,
+        f.total_rentals,
+        w.weather_desc,
+        w.avg_temp_celsius,
+        w.avg_humidity_percent,
+        w.avg_windspeed_kmh
+    FROM fct_hourly_rentals f
+    JOIN dim_weather w ON f.weather_id = w.weather_id
+"""
+
+def get_fact(conn, columns=None):
+    """Load the joined fact table, reusing a local Parquet copy while the warehouse data is unchanged."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(date), COUNT(*) FROM fct_hourly_rentals")
+    latest, row_count = cursor.fetchone()
+    cache_key = f"{latest}:{row_count}".encode()
+
+    if os.path.exists(CACHE_PATH) and pq.read_metadata(CACHE_PATH).metadata.get(b'cache_key') == cache_key:
+        print("📦 Using cached fact table")
+        return pd.read_parquet(CACHE_PATH, columns=columns)
+
+    cursor.execute(FACT_SQL)
+    df = cursor.fetch_pandas_all()
+
+    # Record the cache key in the Parquet footer so the next run can validate it cheaply
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), b'cache_key': cache_key})
+    pq.write_table(table, CACHE_PATH)
+
+    return df[columns] if columns is not None else df
@@ -0,0 +1,54 @@
+import atexit
+import os
+import threading
+import snowflake.connector
+
+# One cached connection per thread: Snowflake connections are not safe to share across threads
+_local = threading.local()
+_open_conns = []
+_lock = threading.Lock()
+
+def conn_params():
+    """Snowflake connection parameters from environment variables."""
+    return {
+        'account': os.getenv('SNOWFLAKE_ACCOUNT'),
+        'user': os.getenv('SNOWFLAKE_USER'),
+        'password': os.getenv('SNOWFLAKE_PASSWORD'),
+        'database': os.getenv('SNOWFLAKE_DATABASE'),
+        'schema': os.getenv('SNOWFLAKE_SCHEMA'),
+        'warehouse': os.getenv('SNOWFLAKE_WAREHOUSE'),
+        'role': os.getenv('SNOWFLAKE_ROLE')
+    }
+
+def get_conn():
+    """Return this thread's Snowflake connection, opening it on first use or after it was closed."""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or conn.is_closed():
+        conn = snowflake.connector.connect(**conn_params(), client_session_keep_alive=True)
+        _local.conn = conn
+        with _lock:
+            _open_conns.append(conn)
+    return conn
+
+def invalidate_conn():
+    """Drop this thread's cached connection (e.g. after its session expired) so the next get_conn() reopens it."""
+    conn = getattr(_local, 'conn', None)
+    _local.conn = None
+    if conn is None:
+        return
+    with _lock:
+        if conn in _open_conns:
+            _open_conns.remove(conn)
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+@atexit.register
+def close_all():
+    """Close every connection opened by this process."""
+    with _lock:
+        for conn in _open_conns:
+            if not conn.is_closed():
+                conn.close()
+        _open_conns.clear()
@@ -1,10 +1,78 @@
 #!/usr/bin/env python3
 
 import snowflake.connector
-import pandas as pd
 import os
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from _csv_export import write_csv
+
+def export_hourly_trends(conn_params):
+    """Export pre-aggregated hourly trends by day of week."""
+    print("📈 Exporting hourly trends data...")
+    conn = snowflake.connector.connect(**conn_params)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT *
+            FROM mart_hourly_trends
+            ORDER BY day_name, hour
+        """)
+        hourly_df = cursor.fetch_pandas_all()
+    finally:
+        conn.close()
+    write_csv(hourly_df, 'dashboard_exports/hourly_trends.csv')
+    return len(hourly_df)
+
+def export_weather_impact(conn_params):
+    """Export weather impact summary."""
+    print("🌧️ Exporting weather impact data...")
+    conn = snowflake.connector.connect(**conn_params)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT *
+            FROM mart_weather_impact
+        """)
+        weather_df = cursor.fetch_pandas_all()
+    finally:
+        conn.close()
+    write_csv(weather_df, 'dashboard_exports/weather_impact.csv')
+    return len(weather_df)
+
+def export_seasonal_patterns(conn_params):
+    """Export monthly and seasonal rental patterns."""
+    print("🍂 Exporting seasonal patterns...")
+    conn = snowflake.connector.connect(**conn_params)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT *
+            FROM mart_seasonal_patterns
+            ORDER BY year, month
+        """)
+        seasonal_df = cursor.fetch_pandas_all()
+    finally:
+        conn.close()
+    write_csv(seasonal_df, 'dashboard_exports/seasonal_patterns.csv')
+    return len(seasonal_df)
+
+def export_user_behavior(conn_params):
+    """Export pre-aggregated casual vs registered user behavior."""
+    print("👥 Exporting user behavior data...")
+    conn = snowflake.connector.connect(**conn_params)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT *
+            FROM mart_user_behavior_by_time_of_day
+            ORDER BY day_name, hour
+        """)
+        user_df = cursor.fetch_pandas_all()
+    finally:
+        conn.close()
+    write_csv(user_df, 'dashboard_exports/user_behavior.csv')
+    return len(user_df)
 
 def export_dashboard_data():
     """Export data for dashboard creation in Tableau/PowerBI/Looker."""
@@ -21,88 +89,27 @@ def export_dashboard_data():
     }
     
     print("🔗 Connecting to Snowflake for dashboard data export...")
-    conn = snowflake.connector.connect(**conn_params)
     
     try:
         # Create dashboard directory
         os.makedirs('dashboard_exports', exist_ok=True)
         
-        # 1. Hourly trends for time series visualization
-        print("📈 Exporting hourly trends data...")
-        hourly_df = pd.read_sql("""
-            SELECT 
-                date,
-                hour,
-                day_name,
-                season_name,
-                weather_id,
-                time_of_day,
-                total_rentals,
-                casual_users,
-                registered_users
-            FROM fct_hourly_rentals 
-            ORDER BY date, hour
-        """, conn)
-        hourly_df.to_csv('dashboard_exports/hourly_trends.csv', index=False)
-        
-        # 2. Weather impact summary
-        print("🌧️ Exporting weather impact data...")
-        weather_df = pd.read_sql("""
-            SELECT 
-                w.weather_desc,
-                w.avg_temp_celsius,
-                w.avg_humidity_percent,
-                w.avg_windspeed_kmh,
-                COUNT(f.record_id) as total_hours,
-                AVG(f.total_rentals) as avg_rentals,
-                SUM(f.total_rentals) as total_rentals
-            FROM fct_hourly_rentals f
-            JOIN dim_weather w ON f.weather_id = w.weather_id
-            GROUP BY w.weather_id, w.weather_desc, w.avg_temp_celsius, 
-                     w.avg_humidity_percent, w.avg_windspeed_kmh
-        """, conn)
-        weather_df.to_csv('dashboard_exports/weather_impact.csv', index=False)
-        
-        # 3. Seasonal patterns
-        print("🍂 Exporting seasonal patterns...")
-        seasonal_df = pd.read_sql("""
-            SELECT 
-                season_name,
-                EXTRACT(MONTH FROM date) as month,
-                EXTRACT(YEAR FROM date) as year,
-                AVG(total_rentals) as avg_rentals,
-                COUNT(*) as total_hours
-            FROM fct_hourly_rentals 
-            GROUP BY season_name, EXTRACT(MONTH FROM date), EXTRACT(YEAR FROM date)
-            ORDER BY year, month
-        """, conn)
-        seasonal_df.to_csv('dashboard_exports/seasonal_patterns.csv', index=False)
-        
-        # 4. User behavior analysis
-        print("👥 Exporting user behavior data...")
-        user_df = pd.read_sql("""
-            SELECT 
-                date,
-                hour,
-                day_name,
-                time_of_day,
-                casual_users,
-                registered_users,
-                total_rentals,
-                ROUND((casual_users::FLOAT / total_rentals) * 100, 2) as casual_percentage
-            FROM fct_hourly_rentals 
-            WHERE total_rentals > 0
-        """, conn)
-        user_df.to_csv('dashboard_exports/user_behavior.csv', index=False)
+        # 1-4. Run the exports concurrently, one connection per query since
+        # Snowflake connections are not safe to share across threads
+        exports = [export_hourly_trends, export_weather_impact,
+                   export_seasonal_patterns, export_user_behavior]
+        with ThreadPoolExecutor(max_workers=len(exports)) as executor:
+            hourly_count, weather_count, seasonal_count, user_count = executor.map(
+                lambda export: export(conn_params), exports)
         
         # 5. Create dashboard configuration file
         dashboard_config = {
             "data_sources": {
                 "hourly_trends": {
                     "file": "hourly_trends.csv",
-                    "description": "Time series data for rental trends",
-                    "key_fields": ["date", "hour", "total_rentals"],
-                    "visualizations": ["Line chart", "Heatmap", "Calendar view"]
+                    "description": "Average rentals by day of week and hour",
+                    "key_fields": ["day_name", "hour", "avg_rentals"],
+                    "visualizations": ["Heatmap", "Line chart"]
                 },
                 "weather_impact": {
                     "file": "weather_impact.csv", 
@@ -118,8 +125,8 @@ def export_dashboard_data():
                 },
                 "user_behavior": {
                     "file": "user_behavior.csv",
-                    "description": "Casual vs registered user patterns",
-                    "key_fields": ["time_of_day", "casual_percentage", "total_rentals"],
+                    "description": "Casual vs registered user patterns by day and hour",
+                    "key_fields": ["day_name", "hour", "time_of_day", "casual_percentage", "total_rentals"],
                     "visualizations": ["Stacked bar", "Pie chart", "User segmentation"]
                 }
             },
@@ -164,18 +171,16 @@ def export_dashboard_data():
         
         print(f"\n✅ Dashboard data exported successfully!")
         print(f"📁 Files created in 'dashboard_exports/' directory:")
-        print(f"   • hourly_trends.csv ({len(hourly_df):,} records)")
-        print(f"   • weather_impact.csv ({len(weather_df):,} records)")  
-        print(f"   • seasonal_patterns.csv ({len(seasonal_df):,} records)")
-        print(f"   • user_behavior.csv ({len(user_df):,} records)")
+        print(f"   • hourly_trends.csv ({hourly_count:,} records)")
+        print(f"   • weather_impact.csv ({weather_count:,} records)")  
+        print(f"   • seasonal_patterns.csv ({seasonal_count:,} records)")
+        print(f"   • user_behavior.csv ({user_count:,} records)")
         print(f"   • dashboard_config.json (configuration)")
         print(f"   • tableau_connection.txt (connection details)")
         
     except Exception as e:
         print(f"❌ Error: {e}")
         raise
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     export_dashboard_data() 
\ No newline at end of file
@@ -9,6 +9,8 @@ import scipy.stats as stats
 from scipy.stats import pearsonr, spearmanr
 import os
 import warnings
+from _fact_cache import get_fact
+from _csv_export import write_csv
 warnings.filterwarnings('ignore')
 
 def statistical_analysis():
@@ -32,18 +34,24 @@ def statistical_analysis():
     os.makedirs('statistical_analysis', exist_ok=True)
     
     try:
-        # Load data for analysis
-        df = pd.read_sql("""
-            SELECT 
-                f.*,
-                w.avg_temp_celsius,
-                w.avg_humidity_percent,
-                w.avg_windspeed_kmh,
-                CASE WHEN day_name IN ('Saturday', 'Sunday') THEN 1 ELSE 0 END as is_weekend,
-                CASE WHEN hour BETWEEN 7 AND 9 OR hour BETWEEN 17 AND 19 THEN 1 ELSE 0 END as is_rush_hour
-            FROM fct_hourly_rentals f
-            JOIN dim_weather w ON f.weather_id = w.weather_id
-        """, conn)
+        # Load data for analysis (served from the local Parquet cache when unchanged)
+        df = get_fact(conn, columns=[
+            'date', 'hour', 'day_name', 'season_name', 'total_rentals',
+            'casual_users', 'registered_users', 'avg_temp_celsius',
+            'avg_humidity_percent', 'avg_windspeed_kmh'
+        ])
+        
+        # Calendar flags are derived client-side rather than widening every row on the wire
+        hours = df['hour'].to_numpy()
+        df['is_rush_hour'] = (((hours >= 7) & (hours <= 9)) | ((hours >= 17) & (hours <= 19))).astype(np.int8)
+        df['is_weekend'] = df['day_name'].isin(['Saturday', 'Sunday']).astype(np.int8)
+        
+        # Low-cardinality string columns are far smaller as ordered categoricals,
+        # and groupby then returns them in calendar order
+        df['day_name'] = pd.Categorical(df['day_name'], ordered=True, categories=[
+            'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+        df['season_name'] = pd.Categorical(df['season_name'], ordered=True, categories=[
+            'Spring', 'Summer', 'Fall', 'Winter'])
         
         print(f"📊 Loaded {len(df):,} records for statistical analysis")
         
@@ -53,13 +61,19 @@ def statistical_analysis():
         
         desc_stats = df[['total_rentals', 'casual_users', 'registered_users', 
                         'avg_temp_celsius', 'avg_humidity_percent']].describe()
-        desc_stats.to_csv('statistical_analysis/descriptive_statistics.csv')
+        write_csv(desc_stats, 'statistical_analysis/descriptive_statistics.csv', index=True)
+        
+        # All quantiles in one pass over a contiguous array, reused by the outlier analysis
+        rentals = df['total_rentals'].to_numpy(dtype=np.float32)
+        q25, q50, q75, q95 = np.percentile(rentals, [25, 50, 75, 95])
+        rentals_mean = rentals.mean()
+        rentals_std = rentals.std(ddof=1)
         
         print("Key Statistics:")
-        print(f"• Average hourly rentals: {df['total_rentals'].mean():.1f}")
-        print(f"• Median hourly rentals: {df['total_rentals'].median():.1f}")
-        print(f"• Standard deviation: {df['total_rentals'].std():.1f}")
-        print(f"• 95th percentile: {df['total_rentals'].quantile(0.95):.1f}")
+        print(f"• Average hourly rentals: {rentals_mean:.1f}")
+        print(f"• Median hourly rentals: {q50:.1f}")
+        print(f"• Standard deviation: {rentals_std:.1f}")
+        print(f"• 95th percentile: {q95:.1f}")
         
         # 2. CORRELATION ANALYSIS
         print("\n🔗 CORRELATION ANALYSIS")
@@ -69,19 +83,21 @@ def statistical_analysis():
                            'avg_windspeed_kmh', 'hour', 'is_weekend', 'is_rush_hour']
         
         corr_matrix = df[correlation_vars].corr()
-        corr_matrix.to_csv('statistical_analysis/correlation_matrix.csv')
+        write_csv(corr_matrix, 'statistical_analysis/correlation_matrix.csv', index=True)
         
         # Strong correlations (>0.3 or <-0.3)
-        strong_corrs = []
-        for i in range(len(corr_matrix.columns)):
-            for j in range(i+1, len(corr_matrix.columns)):
-                corr_val = corr_matrix.iloc[i,j]
-                if abs(corr_val) > 0.3:
-                    strong_corrs.append({
-                        'var1': corr_matrix.columns[i],
-                        'var2': corr_matrix.columns[j], 
-                        'correlation': corr_val
-                    })
+        corr_values = corr_matrix.to_numpy()
+        rows, cols = np.triu_indices_from(corr_values, k=1)
+        pair_corrs = corr_values[rows, cols]
+        strong = np.abs(pair_corrs) > 0.3
+        strong_corrs = [
+            {
+                'var1': corr_matrix.columns[i],
+                'var2': corr_matrix.columns[j],
+                'correlation': float(corr_val)
+            }
+            for i, j, corr_val in zip(rows[strong], cols[strong], pair_corrs[strong])
+        ]
         
         print("Strong correlations found:")
         for corr in sorted(strong_corrs, key=lambda x: abs(x['correlation']), reverse=True):
@@ -92,8 +108,9 @@ def statistical_analysis():
         print("=" * 25)
         
         # T-test: Weekend vs Weekday rentals
-        weekend_rentals = df[df['is_weekend'] == 1]['total_rentals']
-        weekday_rentals = df[df['is_weekend'] == 0]['total_rentals']
+        weekend_groups = {flag: group.to_numpy() for flag, group in df.groupby('is_weekend')['total_rentals']}
+        weekend_rentals = weekend_groups[1]
+        weekday_rentals = weekend_groups[0]
         
         t_stat, p_value = stats.ttest_ind(weekend_rentals, weekday_rentals)
         print(f"Weekend vs Weekday T-test:")
@@ -102,38 +119,39 @@ def statistical_analysis():
         print(f"• T-statistic: {t_stat:.3f}")
         print(f"• P-value: {p_value:.6f}")
         print(f"• Significant difference: {'Yes' if p_value < 0.05 else 'No'}")
+        del weekend_groups, weekend_rentals, weekday_rentals
         
         # ANOVA: Seasonal differences
-        spring = df[df['season_name'] == 'Spring']['total_rentals']
-        summer = df[df['season_name'] == 'Summer']['total_rentals'] 
-        fall = df[df['season_name'] == 'Fall']['total_rentals']
-        winter = df[df['season_name'] == 'Winter']['total_rentals']
+        season_groups = {name: group.to_numpy()
+                         for name, group in df.groupby('season_name', observed=True)['total_rentals']}
         
-        f_stat, p_value_anova = stats.f_oneway(spring, summer, fall, winter)
+        f_stat, p_value_anova = stats.f_oneway(season_groups['Spring'], season_groups['Summer'],
+                                               season_groups['Fall'], season_groups['Winter'])
         print(f"\nSeasonal ANOVA Test:")
         print(f"• F-statistic: {f_stat:.3f}")
         print(f"• P-value: {p_value_anova:.6f}")
         print(f"• Significant seasonal effect: {'Yes' if p_value_anova < 0.05 else 'No'}")
+        del season_groups
         
         # 4. WEATHER IMPACT ANALYSIS
         print("\n🌤️ WEATHER IMPACT QUANTIFICATION")
         print("=" * 35)
         
-        # Linear regression coefficients for weather variables
-        from sklearn.linear_model import LinearRegression
-        
+        # Linear regression coefficients for weather variables (closed-form least squares)
         weather_vars = ['avg_temp_celsius', 'avg_humidity_percent', 'avg_windspeed_kmh']
-        X = df[weather_vars]
-        y = df['total_rentals']
+        X = df[weather_vars].to_numpy(dtype=np.float32)
+        y = df['total_rentals'].to_numpy(dtype=np.float32)
         
-        model = LinearRegression()
-        model.fit(X, y)
+        X_design = np.c_[X, np.ones(len(X), dtype=np.float32)]
+        coef, *_ = np.linalg.lstsq(X_design, y, rcond=None)
         
         print("Weather impact coefficients (rentals per unit change):")
         for i, var in enumerate(weather_vars):
-            print(f"• {var}: {model.coef_[i]:.2f}")
+            print(f"• {var}: {coef[i]:.2f}")
         
-        r2_score = model.score(X, y)
+        y_pred = X_design @ coef
+        r2_score = float(1 - ((y - y_pred) ** 2).sum() / ((y - y.mean()) ** 2).sum())
+        del X, y, X_design, y_pred
         print(f"• Model R²: {r2_score:.3f}")
         
         # 5. TIME SERIES PATTERNS
@@ -142,43 +160,41 @@ def statistical_analysis():
         
         # Group by hour for daily patterns
         hourly_avg = df.groupby('hour')['total_rentals'].agg(['mean', 'std']).round(2)
-        hourly_avg.to_csv('statistical_analysis/hourly_patterns.csv')
+        write_csv(hourly_avg, 'statistical_analysis/hourly_patterns.csv', index=True)
         
         peak_hours = hourly_avg.nlargest(3, 'mean')
         print("Top 3 peak hours:")
-        for hour, data in peak_hours.iterrows():
-            print(f"• Hour {hour}: {data['mean']:.1f} ± {data['std']:.1f} rentals")
+        for hour, mean, std in peak_hours.itertuples(name=None):
+            print(f"• Hour {hour}: {mean:.1f} ± {std:.1f} rentals")
         
         # Day of week patterns
-        dow_avg = df.groupby('day_name')['total_rentals'].agg(['mean', 'std']).round(2)
-        dow_avg = dow_avg.reindex(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
-                                  'Friday', 'Saturday', 'Sunday'])
-        dow_avg.to_csv('statistical_analysis/daily_patterns.csv')
+        dow_avg = df.groupby('day_name', observed=False)['total_rentals'].agg(['mean', 'std']).round(2)
+        write_csv(dow_avg, 'statistical_analysis/daily_patterns.csv', index=True)
         
         # 6. OUTLIER ANALYSIS
         print("\n🔍 OUTLIER DETECTION")
         print("=" * 20)
         
-        Q1 = df['total_rentals'].quantile(0.25)
-        Q3 = df['total_rentals'].quantile(0.75)
-        IQR = Q3 - Q1
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
+        # Compute the masks once, reusing the quartiles from the descriptive statistics
+        IQR = q75 - q25
+        lower_bound = q25 - 1.5 * IQR
+        upper_bound = q75 + 1.5 * IQR
         
-        outliers = df[(df['total_rentals'] < lower_bound) | 
-                     (df['total_rentals'] > upper_bound)]
+        low_mask = rentals < lower_bound
+        high_mask = rentals > upper_bound
+        outliers = df[low_mask | high_mask]
         
         print(f"• Total outliers detected: {len(outliers)} ({len(outliers)/len(df)*100:.1f}%)")
-        print(f"• Upper outliers (>{upper_bound:.0f}): {len(outliers[outliers['total_rentals'] > upper_bound])}")
-        print(f"• Lower outliers (<{lower_bound:.0f}): {len(outliers[outliers['total_rentals'] < lower_bound])}")
+        print(f"• Upper outliers (>{upper_bound:.0f}): {int(high_mask.sum())}")
+        print(f"• Lower outliers (<{lower_bound:.0f}): {int(low_mask.sum())}")
         
-        outliers.to_csv('statistical_analysis/outliers.csv', index=False)
+        write_csv(outliers, 'statistical_analysis/outliers.csv')
         
         # 7. BUSINESS INSIGHTS SUMMARY
         insights = {
             "key_findings": [
                 f"Peak demand occurs at hour {hourly_avg.idxmax()['mean']} with {hourly_avg.max()['mean']:.0f} avg rentals",
-                f"Temperature has {model.coef_[0]:.1f} rental impact per degree celsius",
+                f"Temperature has {coef[0]:.1f} rental impact per degree celsius",
                 f"{'Significant' if p_value < 0.05 else 'No significant'} difference between weekend/weekday usage",
                 f"Weather explains {r2_score*100:.1f}% of rental variance",
                 f"{len(outliers)/len(df)*100:.1f}% of hours show unusual demand patterns"
@@ -1,70 +1,178 @@
 #!/usr/bin/env python3
 
-import snowflake.connector
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import dash
-from dash import dcc, html
 import os
+import shutil
 import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from _snowflake_pool import get_conn
+
+# Pooled connection each thread has already configured for the visualization session
+_configured = threading.local()
+
+def viz_conn():
+    """This thread's pooled connection, tagged for the visualization workload."""
+    conn = get_conn()
+    if getattr(_configured, 'conn', None) is not conn:
+        # Identical queries are then answered from Snowflake's result cache and are easy to find in query history.
+        # Session settings persist, so this runs once per connection
+        cursor = conn.cursor()
+        cursor.execute("ALTER SESSION SET USE_CACHED_RESULT = TRUE")
+        cursor.execute("ALTER SESSION SET QUERY_TAG = 'bikeshare_viz'")
+        _configured.conn = conn
+    return conn
+
+def fingerprint(conn):
+    """Cheap probe that changes whenever the fact table is reloaded."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT MAX(loaded_at), COUNT(*) FROM fct_hourly_rentals")
+    latest_load, row_count = cursor.fetchone()
+    return f"{latest_load}:{row_count}"
+
+def fingerprint_cache_dir(data_fingerprint, cache_dir='visualizations/.cache'):
+    """Directory holding the cached results for one version of the fact table."""
+    return os.path.join(cache_dir, hashlib.sha1(data_fingerprint.encode()).hexdigest())
+
+def prune_cache(data_fingerprint, cache_dir='visualizations/.cache'):
+    """Delete cached results from earlier versions of the fact table."""
+    if not os.path.isdir(cache_dir):
+        return
+    current = fingerprint_cache_dir(data_fingerprint, cache_dir)
+    for entry in os.scandir(cache_dir):
+        if entry.path != current:
+            if entry.is_dir():
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+
+def cached_sql(sql, data_fingerprint, cache_dir='visualizations/.cache'):
+    """Run a query on this thread's connection, reusing a local Parquet copy of its result while the fingerprint is unchanged."""
+    cache_dir = fingerprint_cache_dir(data_fingerprint, cache_dir)
+    cache_key = hashlib.sha1(sql.encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, f'{cache_key}.parquet')
+    if os.path.exists(cache_path):
+        return pd.read_parquet(cache_path, engine='pyarrow')
+    
+    cursor = viz_conn().cursor()
+    cursor.execute(sql)
+    df = cursor.fetch_pandas_all()
+    os.makedirs(cache_dir, exist_ok=True)
+    df.to_parquet(cache_path, engine='pyarrow', compression='zstd', use_dictionary=True, index=False)
+    return df
 
 def create_visualizations():
     """Create interactive visualizations for data visualization portfolio."""
     
-    # Get Snowflake connection parameters
-    conn_params = {
-        'account': os.getenv('SNOWFLAKE_ACCOUNT'),
-        'user': os.getenv('SNOWFLAKE_USER'),
-        'password': os.getenv('SNOWFLAKE_PASSWORD'),
-        'database': os.getenv('SNOWFLAKE_DATABASE'),
-        'schema': os.getenv('SNOWFLAKE_SCHEMA'),
-        'warehouse': os.getenv('SNOWFLAKE_WAREHOUSE'),
-        'role': os.getenv('SNOWFLAKE_ROLE')
-    }
-    
     print("🔗 Connecting to Snowflake for visualization data...")
-    conn = snowflake.connector.connect(**conn_params)
+    conn = viz_conn()
     
     # Create visualizations directory
     os.makedirs('visualizations', exist_ok=True)
     
     try:
-        # Load data for visualizations
-        df = pd.read_sql("""
+        # Results are cached locally per query and reused until the fact table changes
+        data_fingerprint = fingerprint(conn)
+        prune_cache(data_fingerprint)
+        
+        # Load pre-aggregated data for visualizations; Snowflake returns only the plotted rows
+        queries = {
+            'daily_rentals': """
+            SELECT 
+                date,
+                SUM(total_rentals) as total_rentals,
+                SUM(casual_users) as casual_users,
+                SUM(registered_users) as registered_users
+            FROM fct_hourly_rentals
+            GROUP BY date
+            ORDER BY date
+            """,
+        
+            'hourly_by_day': """
+            SELECT 
+                hour,
+                day_name,
+                AVG(total_rentals) as avg_rentals
+            FROM fct_hourly_rentals
+            GROUP BY hour, day_name
+            """,
+        
+            # Weather attributes are joined only after aggregating the fact table by weather_id.
+            # Binned so the scatter payload stays bounded regardless of how many hours are loaded
+            'temp_rentals': """
+            WITH binned AS (
+                SELECT 
+                    weather_id,
+                    ROUND(total_rentals, -1) as total_rentals,
+                    season_name,
+                    COUNT(*) as hours
+                FROM fct_hourly_rentals
+                GROUP BY 1, 2, 3
+            )
+            SELECT 
+                ROUND(w.avg_temp_celsius, 1) as avg_temp_celsius,
+                b.total_rentals,
+                b.season_name,
+                SUM(b.hours) as hours
+            FROM binned b
+            JOIN dim_weather w ON b.weather_id = w.weather_id
+            GROUP BY 1, 2, 3
+            """,
+        
+            'weather_stats': """
+            WITH by_weather AS (
+                SELECT 
+                    weather_id,
+                    AVG(total_rentals) as avg_rentals,
+                    COUNT(*) as count
+                FROM fct_hourly_rentals
+                GROUP BY weather_id
+            )
             SELECT 
-                f.*,
                 w.weather_desc,
-                w.avg_temp_celsius,
-                w.avg_humidity_percent,
-                w.avg_windspeed_kmh,
-                CASE WHEN day_name IN ('Saturday', 'Sunday') THEN 1 ELSE 0 END as is_weekend,
-                CASE WHEN hour BETWEEN 7 AND 9 OR hour BETWEEN 17 AND 19 THEN 1 ELSE 0 END as is_rush_hour
-            FROM fct_hourly_rentals f
-            JOIN dim_weather w ON f.weather_id = w.weather_id
-        """, conn)
+                ROUND(b.avg_rentals, 2) as avg_rentals,
+                b.count
+            FROM by_weather b
+            JOIN dim_weather w ON b.weather_id = w.weather_id
+            ORDER BY avg_rentals DESC
+            """
+        }
         
-        print(f"📊 Loaded {len(df):,} records for visualization")
+        # Each worker thread runs its query on its own pooled connection, so the queries overlap in the warehouse
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = {name: executor.submit(cached_sql, sql, data_fingerprint)
+                       for name, sql in queries.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        daily_rentals = results['daily_rentals']
+        hourly_by_day = results['hourly_by_day']
+        temp_rentals = results['temp_rentals']
+        weather_stats = results['weather_stats']
+        
+        print(f"📊 Loaded {len(daily_rentals):,} days and {len(temp_rentals):,} temperature bins for visualization")
+        
+        # Beyond two years a daily series has more points than the chart can resolve; plot weekly totals
+        daily_rentals['date'] = pd.to_datetime(daily_rentals['date'])
+        if daily_rentals['date'].max() - daily_rentals['date'].min() > pd.Timedelta(days=730):
+            daily_rentals = daily_rentals.resample('W', on='date').sum().reset_index()
         
         # 1. TIME SERIES ANALYSIS
         print("\n📈 Creating time series visualizations...")
         
         # Daily rentals trend
-        daily_rentals = df.groupby('date')['total_rentals'].sum().reset_index()
         fig_daily = px.line(daily_rentals, x='date', y='total_rentals',
                           title='Daily Bike Rental Trends',
                           labels={'total_rentals': 'Total Rentals', 'date': 'Date'})
         fig_daily.write_html('visualizations/daily_trends.html')
         
-        # Hourly heatmap
-        hourly_avg = df.pivot_table(values='total_rentals', 
-                                  index='hour',
-                                  columns='day_name',
-                                  aggfunc='mean')
-        hourly_avg = hourly_avg.reindex(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 
-                                       'Friday', 'Saturday', 'Sunday'], axis=1)
+        # Hourly heatmap (ordered categorical lays the columns out Monday-first)
+        hourly_by_day['day_name'] = pd.Categorical(hourly_by_day['day_name'], ordered=True, categories=[
+            'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+        hourly_avg = hourly_by_day.pivot(index='hour', columns='day_name', values='avg_rentals')
         
         fig_heatmap = px.imshow(hourly_avg,
                                title='Average Hourly Rentals by Day of Week',
@@ -76,21 +184,19 @@ def create_visualizations():
         print("🌤️ Creating weather impact visualizations...")
         
         # Temperature vs Rentals scatter
-        fig_temp = px.scatter(df, x='avg_temp_celsius', y='total_rentals',
-                            color='season_name',
+        temp_rentals['season_name'] = pd.Categorical(temp_rentals['season_name'], ordered=True,
+                                                     categories=['Spring', 'Summer', 'Fall', 'Winter'])
+        fig_temp = px.scatter(temp_rentals, x='avg_temp_celsius', y='total_rentals',
+                            color='season_name', size='hours',
+                            render_mode='webgl',  # scattergl: GPU-rendered instead of one SVG node per point
                             title='Temperature Impact on Rentals',
                             labels={'avg_temp_celsius': 'Temperature (°C)',
                                   'total_rentals': 'Total Rentals',
-                                  'season_name': 'Season'})
+                                  'season_name': 'Season',
+                                  'hours': 'Hours'})
         fig_temp.write_html('visualizations/temperature_impact.html')
         
         # Weather conditions comparison
-        weather_stats = df.groupby('weather_desc').agg({
-            'total_rentals': ['mean', 'count']
-        }).round(2)
-        weather_stats.columns = ['avg_rentals', 'count']
-        weather_stats = weather_stats.reset_index()
-        
         fig_weather = px.bar(weather_stats, x='weather_desc', y='avg_rentals',
                            title='Average Rentals by Weather Condition',
                            labels={'weather_desc': 'Weather Condition',
@@ -101,12 +207,7 @@ def create_visualizations():
         print("👥 Creating user segmentation visualizations...")
         
         # User type distribution
-        user_type = df.groupby('date').agg({
-            'casual_users': 'sum',
-            'registered_users': 'sum'
-        }).reset_index()
-        
-        fig_users = px.area(user_type, x='date',
+        fig_users = px.area(daily_rentals, x='date',
                           y=['casual_users', 'registered_users'],
                           title='Casual vs Registered Users Over Time',
                           labels={'value': 'Number of Users',
@@ -114,41 +215,14 @@ def create_visualizations():
                                 'date': 'Date'})
         fig_users.write_html('visualizations/user_segments.html')
         
-        # 4. INTERACTIVE DASHBOARD
-        print("🎯 Creating interactive dashboard...")
-        
-        app = dash.Dash(__name__)
-        
-        app.layout = html.Div([
-            html.H1("Bike Share Analytics Dashboard", 
-                   style={'textAlign': 'center', 'color': '#2c3e50'}),
-            
-            html.Div([
-                html.Div([
-                    html.H3("Daily Trends"),
-                    dcc.Graph(figure=fig_daily)
-                ], className='six columns'),
-                
-                html.Div([
-                    html.H3("Weather Impact"),
-                    dcc.Graph(figure=fig_temp)
-                ], className='six columns')
-            ], className='row'),
-            
-            html.Div([
-                html.Div([
-                    html.H3("Hourly Patterns"),
-                    dcc.Graph(figure=fig_heatmap)
-                ], className='six columns'),
-                
-                html.Div([
-                    html.H3("User Segments"),
-                    dcc.Graph(figure=fig_users)
-                ], className='six columns')
-            ], className='row')
-        ])
-        
-        app.run_server(debug=True, port=8050)
+        # 4. DASHBOARD FIGURES
+        print("🎯 Exporting dashboard figures...")
+        
+        # The dashboard is served separately by dashboard.py from these pre-rendered figures
+        fig_daily.write_json('visualizations/daily_trends.json')
+        fig_temp.write_json('visualizations/temperature_impact.json')
+        fig_heatmap.write_json('visualizations/hourly_heatmap.json')
+        fig_users.write_json('visualizations/user_segments.json')
         
         # 5. EXPORT VISUALIZATION METADATA
         viz_metadata = {
@@ -227,13 +301,12 @@ def create_visualizations():
         print(f"   • weather_impact.html")
         print(f"   • user_segments.html")
         print(f"   • metadata.json")
-        print(f"\n🌐 Interactive dashboard running at http://localhost:8050")
+        print(f"   • dashboard figures (*.json)")
+        print(f"\n🌐 Serve the interactive dashboard with: python scripts/dashboard.py")
         
     except Exception as e:
         print(f"❌ Error: {e}")
         raise
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     create_visualizations() 
\ No newline at end of file
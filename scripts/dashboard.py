@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import plotly.io as pio
+import dash
+from dash import dcc, html
+
+FIGURE_DIR = 'visualizations'
+
+def load_figure(name):
+    """Load a figure pre-rendered by create_visualizations.py."""
+    return pio.read_json(f'{FIGURE_DIR}/{name}.json')
+
+def create_app():
+    """Build the dashboard layout from the exported figures."""
+    app = dash.Dash(__name__)
+    
+    app.layout = html.Div([
+        html.H1("Bike Share Analytics Dashboard", 
+               style={'textAlign': 'center', 'color': '#2c3e50'}),
+        
+        html.Div([
+            html.Div([
+                html.H3("Daily Trends"),
+                dcc.Graph(figure=load_figure('daily_trends'))
+            ], className='six columns'),
+            
+            html.Div([
+                html.H3("Weather Impact"),
+                dcc.Graph(figure=load_figure('temperature_impact'), config={'plotGlPixelRatio': 2})
+            ], className='six columns')
+        ], className='row'),
+        
+        html.Div([
+            html.Div([
+                html.H3("Hourly Patterns"),
+                dcc.Graph(figure=load_figure('hourly_heatmap'))
+            ], className='six columns'),
+            
+            html.Div([
+                html.H3("User Segments"),
+                dcc.Graph(figure=load_figure('user_segments'))
+            ], className='six columns')
+        ], className='row')
+    ])
+    
+    return app
+
+if __name__ == "__main__":
+    print("🌐 Interactive dashboard running at http://localhost:8050")
+    create_app().run_server(debug=False, threaded=True, host='0.0.0.0', port=8050)
@@ -1,29 +1,18 @@
 #!/usr/bin/env python3
 
 import pandas as pd
-import snowflake.connector
-import os
+from snowflake.connector.pandas_tools import write_pandas
 from datetime import datetime
 from pathlib import Path
+from _snowflake_pool import get_conn
 
 def load_data_to_snowflake():
     # Get the project root directory
     project_root = Path(__file__).parent.parent
     data_file = project_root / 'data' / 'raw' / 'hour.csv'
     
-    # Get Snowflake connection parameters from environment variables
-    conn_params = {
-        'account': os.getenv('SNOWFLAKE_ACCOUNT'),
-        'user': os.getenv('SNOWFLAKE_USER'),
-        'password': os.getenv('SNOWFLAKE_PASSWORD'),
-        'database': os.getenv('SNOWFLAKE_DATABASE'),
-        'schema': os.getenv('SNOWFLAKE_SCHEMA'),
-        'warehouse': os.getenv('SNOWFLAKE_WAREHOUSE'),
-        'role': os.getenv('SNOWFLAKE_ROLE')
-    }
-    
     print("🔗 Connecting to Snowflake...")
-    conn = snowflake.connector.connect(**conn_params)
+    conn = get_conn()
     cursor = conn.cursor()
     
     try:
@@ -33,37 +22,39 @@ def load_data_to_snowflake():
         cursor.execute("USE SCHEMA RAW")
         
         print("📂 Reading CSV data...")
-        # Read the CSV file
-        df = pd.read_csv(data_file)
+        # Read the CSV file with the Arrow parser and a preset schema (no dtype inference)
+        df = pd.read_csv(
+            data_file,
+            engine='pyarrow',
+            dtype_backend='pyarrow',
+            dtype={
+                'instant': 'int32', 'season': 'int8', 'yr': 'int8', 'mnth': 'int8', 'hr': 'int8',
+                'holiday': 'int8', 'weekday': 'int8', 'workingday': 'int8', 'weathersit': 'int8',
+                'temp': 'float64', 'atemp': 'float64', 'hum': 'float64', 'windspeed': 'float64',
+                'casual': 'int32', 'registered': 'int32', 'cnt': 'int32'
+            },
+            parse_dates=['dteday']
+        )
         print(f"📊 Loaded {len(df)} records from CSV")
         
         # Clear existing data
         print("🧹 Clearing existing data...")
         cursor.execute("TRUNCATE TABLE BIKESHARE_RAW")
         
-        # Insert data in batches
+        # Bulk load via write_pandas: stages the DataFrame as Parquet and issues one COPY INTO per chunk
         print("📤 Uploading data to Snowflake...")
-        batch_size = 1000
-        total_inserted = 0
-        
-        for i in range(0, len(df), batch_size):
-            batch = df.iloc[i:i+batch_size]
-            
-            # Prepare the data for insertion
-            values = []
-            for _, row in batch.iterrows():
-                value = f"({row['instant']}, '{row['dteday']}', {row['season']}, {row['yr']}, {row['mnth']}, {row['hr']}, {row['holiday']}, {row['weekday']}, {row['workingday']}, {row['weathersit']}, {row['temp']}, {row['atemp']}, {row['hum']}, {row['windspeed']}, {row['casual']}, {row['registered']}, {row['cnt']}, CURRENT_TIMESTAMP())"
-                values.append(value)
-            
-            # Execute insert
-            insert_sql = f"""
-            INSERT INTO BIKESHARE_RAW (instant, dteday, season, yr, mnth, hr, holiday, weekday, workingday, weathersit, temp, atemp, hum, windspeed, casual, registered, cnt, loaded_at)
-            VALUES {', '.join(values)}
-            """
-            
-            cursor.execute(insert_sql)
-            total_inserted += len(batch)
-            print(f"✅ Inserted batch {i//batch_size + 1}: {total_inserted}/{len(df)} records")
+        df.columns = [col.upper() for col in df.columns]
+        success, nchunks, nrows, _ = write_pandas(
+            conn, df, 'BIKESHARE_RAW',
+            quote_identifiers=False,
+            chunk_size=100_000,
+            compression='snappy',
+            parallel=4,
+            use_logical_type=True
+        )
+        if not success:
+            raise RuntimeError("write_pandas reported a failed COPY INTO BIKESHARE_RAW")
+        print(f"✅ Inserted {nrows}/{len(df)} records in {nchunks} chunk(s)")
         
         # Verify the data
         print("🔍 Verifying data...")
@@ -95,7 +86,6 @@ def load_data_to_snowflake():
         raise
     finally:
         cursor.close()
-        conn.close()
 
 if __name__ == "__main__":
     load_data_to_snowflake() 
\ No newline at end of file
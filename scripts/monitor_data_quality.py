@@ -1,8 +1,5 @@
 #!/usr/bin/env python3
 
-import snowflake.connector
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import os
 import json
@@ -11,6 +8,7 @@ from typing import Dict, List, Any
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from _snowflake_pool import get_conn
 
 # Configure logging
 logging.basicConfig(
@@ -25,18 +23,21 @@ logging.basicConfig(
 class DataQualityMonitor:
     """Data quality monitoring system for the bike share dataset."""
     
+    # Columns of the joined fact/weather rows checked by check_in_snowflake
+    QUALITY_COLUMNS = [
+        'record_id', 'date', 'hour', 'season_id', 'year', 'month', 'day_of_week',
+        'is_holiday', 'is_workingday', 'weather_id', 'casual_users', 'registered_users',
+        'total_rentals', 'season_name', 'day_name', 'time_of_day', 'weather_desc',
+        'avg_temp_celsius', 'avg_humidity_percent', 'avg_windspeed_kmh'
+    ]
+    NUMERIC_COLUMNS = [
+        'record_id', 'hour', 'season_id', 'year', 'month', 'day_of_week', 'weather_id',
+        'casual_users', 'registered_users', 'total_rentals', 'avg_temp_celsius',
+        'avg_humidity_percent', 'avg_windspeed_kmh'
+    ]
+    
     def __init__(self):
-        """Initialize the data quality monitor with connection parameters."""
-        self.conn_params = {
-            'account': os.getenv('SNOWFLAKE_ACCOUNT'),
-            'user': os.getenv('SNOWFLAKE_USER'),
-            'password': os.getenv('SNOWFLAKE_PASSWORD'),
-            'database': os.getenv('SNOWFLAKE_DATABASE'),
-            'schema': os.getenv('SNOWFLAKE_SCHEMA'),
-            'warehouse': os.getenv('SNOWFLAKE_WAREHOUSE'),
-            'role': os.getenv('SNOWFLAKE_ROLE')
-        }
-        
+        """Initialize the data quality monitor."""
         # Create monitoring directory
         os.makedirs('data_quality', exist_ok=True)
         
@@ -57,89 +58,94 @@ class DataQualityMonitor:
         }
     
     def connect_to_snowflake(self):
-        """Establish connection to Snowflake."""
+        """Get the process's pooled Snowflake connection."""
         try:
-            conn = snowflake.connector.connect(**self.conn_params)
+            conn = get_conn()
             logging.info("✅ Successfully connected to Snowflake")
             return conn
         except Exception as e:
             logging.error(f"❌ Failed to connect to Snowflake: {e}")
             raise
     
-    def check_completeness(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Check data completeness metrics."""
-        completeness_metrics = {}
+    def check_in_snowflake(self, conn) -> Dict[str, Any]:
+        """Compute all quality metrics in a single warehouse query instead of downloading the fact table."""
+        null_exprs = ",\n".join(
+            f"                    COUNT(*) - COUNT({col}) as null_{col}" for col in self.QUALITY_COLUMNS)
+        negative_exprs = ",\n".join(
+            f"                    COUNT_IF({col} < 0) as negative_{col}" for col in self.NUMERIC_COLUMNS)
         
-        # Check for null values
-        null_counts = df.isnull().sum()
-        total_rows = len(df)
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            WITH base AS (
+                SELECT 
+                    f.*,
+                    w.weather_desc,
+                    w.avg_temp_celsius,
+                    w.avg_humidity_percent,
+                    w.avg_windspeed_kmh
+                FROM fct_hourly_rentals f
+                JOIN dim_weather w ON f.weather_id = w.weather_id
+            )
+            SELECT 
+                    COUNT(*) as total_rows,
+{null_exprs},
+{negative_exprs},
+                    COUNT_IF(total_rentals != casual_users + registered_users) as inconsistent_rows,
+                    COUNT_IF(date > CURRENT_DATE()) as future_dates,
+                    MAX(date) as latest_date
+            FROM base
+        """)
+        stats = dict(zip([col[0].lower() for col in cursor.description], cursor.fetchone()))
+        total_rows = stats['total_rows']
         
-        for column in df.columns:
-            null_percentage = (null_counts[column] / total_rows) * 100
-            completeness_metrics[column] = {
-                'null_count': int(null_counts[column]),
+        logging.info(f"📊 Computed quality metrics over {total_rows:,} records in Snowflake")
+        
+        # Shape the results into the per-dimension metric structures used for scoring and alerts
+        completeness_metrics = {}
+        for col in self.QUALITY_COLUMNS:
+            null_count = stats[f'null_{col}']
+            null_percentage = (null_count / total_rows) * 100
+            completeness_metrics[col] = {
+                'null_count': int(null_count),
                 'null_percentage': round(null_percentage, 2),
                 'is_complete': null_percentage <= (1 - self.thresholds['completeness']) * 100
             }
         
-        return completeness_metrics
-    
-    def check_accuracy(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Check data accuracy metrics."""
         accuracy_metrics = {}
-        
-        # Check for negative values in numeric columns
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            negative_count = len(df[df[col] < 0])
+        for col in self.NUMERIC_COLUMNS:
+            negative_count = int(stats[f'negative_{col}'])
             accuracy_metrics[col] = {
                 'negative_count': negative_count,
                 'is_accurate': negative_count == 0
             }
+        accuracy_metrics['date'] = {
+            'future_dates': int(stats['future_dates']),
+            'is_accurate': stats['future_dates'] == 0
+        }
         
-        # Check for invalid dates
-        if 'date' in df.columns:
-            invalid_dates = len(df[df['date'] > datetime.now()])
-            accuracy_metrics['date'] = {
-                'future_dates': invalid_dates,
-                'is_accurate': invalid_dates == 0
-            }
-        
-        return accuracy_metrics
-    
-    def check_timeliness(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Check data timeliness metrics."""
-        timeliness_metrics = {}
-        
-        if 'date' in df.columns:
-            latest_date = df['date'].max()
-            current_date = datetime.now()
-            hours_delay = (current_date - latest_date).total_seconds() / 3600
-            
-            timeliness_metrics = {
-                'latest_date': latest_date.strftime('%Y-%m-%d'),
-                'hours_delay': round(hours_delay, 2),
-                'is_timely': hours_delay <= self.thresholds['timeliness']
-            }
-        
-        return timeliness_metrics
-    
-    def check_consistency(self, df: pd.DataFrame) -> Dict[str, Any]:
-        """Check data consistency metrics."""
-        consistency_metrics = {}
+        latest_date = datetime.combine(stats['latest_date'], datetime.min.time())
+        hours_delay = (datetime.now() - latest_date).total_seconds() / 3600
+        timeliness_metrics = {
+            'latest_date': latest_date.strftime('%Y-%m-%d'),
+            'hours_delay': round(hours_delay, 2),
+            'is_timely': hours_delay <= self.thresholds['timeliness']
+        }
         
-        # Check total_rentals = casual_users + registered_users
-        if all(col in df.columns for col in ['total_rentals', 'casual_users', 'registered_users']):
-            inconsistent_rows = len(df[df['total_rentals'] != df['casual_users'] + df['registered_users']])
-            total_rows = len(df)
-            
-            consistency_metrics['user_counts'] = {
+        inconsistent_rows = int(stats['inconsistent_rows'])
+        consistency_metrics = {
+            'user_counts': {
                 'inconsistent_rows': inconsistent_rows,
                 'consistency_percentage': round((1 - inconsistent_rows/total_rows) * 100, 2),
                 'is_consistent': (1 - inconsistent_rows/total_rows) >= self.thresholds['consistency']
             }
+        }
         
-        return consistency_metrics
+        return {
+            'completeness': completeness_metrics,
+            'accuracy': accuracy_metrics,
+            'timeliness': timeliness_metrics,
+            'consistency': consistency_metrics
+        }
     
     def calculate_quality_score(self, metrics: Dict[str, Any]) -> float:
         """Calculate overall data quality score."""
@@ -243,27 +249,8 @@ class DataQualityMonitor:
         try:
             conn = self.connect_to_snowflake()
             
-            # Load data for quality check
-            df = pd.read_sql("""
-                SELECT 
-                    f.*,
-                    w.weather_desc,
-                    w.avg_temp_celsius,
-                    w.avg_humidity_percent,
-                    w.avg_windspeed_kmh
-                FROM fct_hourly_rentals f
-                JOIN dim_weather w ON f.weather_id = w.weather_id
-            """, conn)
-            
-            logging.info(f"📊 Loaded {len(df):,} records for quality check")
-            
-            # Run quality checks
-            metrics = {
-                'completeness': self.check_completeness(df),
-                'accuracy': self.check_accuracy(df),
-                'timeliness': self.check_timeliness(df),
-                'consistency': self.check_consistency(df)
-            }
+            # Run quality checks in the warehouse
+            metrics = self.check_in_snowflake(conn)
             
             # Calculate quality score
             quality_score = self.calculate_quality_score(metrics)
@@ -292,8 +279,6 @@ class DataQualityMonitor:
         except Exception as e:
             logging.error(f"❌ Quality check failed: {e}")
             raise
-        finally:
-            conn.close()
 
 if __name__ == "__main__":
     monitor = DataQualityMonitor()
@@ -1,19 +1,23 @@
 #!/usr/bin/env python3
 
-import snowflake.connector
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
-import json
+import orjson
 import logging
 import psutil
 import requests
+import asyncio
+import smtplib
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
 from typing import Dict, List, Any
 import time
-from prometheus_client import start_http_server, Gauge, Counter, Histogram
+from prometheus_client import start_http_server, Gauge, Counter, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
 import threading
-from airflow.models import DagRun
-from airflow.settings import Session
+from snowflake.connector.errors import OperationalError, ProgrammingError
+from _snowflake_pool import get_conn, invalidate_conn
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +29,48 @@ logging.basicConfig(
     ]
 )
 
+class SystemResourceCollector(Collector):
+    """Samples host resources when Prometheus scrapes, instead of on a fixed timer."""
+    
+    def __init__(self):
+        # Prime the CPU counter so later non-blocking reads measure usage since the previous call
+        psutil.cpu_percent(interval=None)
+        
+        # Disk usage changes slowly, so it is refreshed at most every 5 minutes
+        self._disk_percent = None
+        self._disk_checked_at = 0.0
+        
+        self._lock = threading.Lock()
+        self.last_sample = {}
+        self.sampled_at = 0.0
+    
+    def sample(self) -> Dict[str, float]:
+        """Read CPU, memory and disk usage percentages."""
+        with self._lock:
+            if time.monotonic() - self._disk_checked_at >= 300:
+                self._disk_percent = psutil.disk_usage('/').percent
+                self._disk_checked_at = time.monotonic()
+            
+            self.last_sample = {
+                'cpu': psutil.cpu_percent(interval=None),
+                'memory': psutil.virtual_memory().percent,
+                'disk': self._disk_percent
+            }
+            self.sampled_at = time.monotonic()
+            return self.last_sample
+    
+    def latest(self, max_age: float = 60) -> Dict[str, float]:
+        """Most recent sample, re-sampling only if it is older than max_age seconds."""
+        if time.monotonic() - self.sampled_at > max_age:
+            return self.sample()
+        return self.last_sample
+    
+    def collect(self):
+        sample = self.sample()
+        yield GaugeMetricFamily('cpu_usage_percent', 'CPU usage percentage', value=sample['cpu'])
+        yield GaugeMetricFamily('memory_usage_percent', 'Memory usage percentage', value=sample['memory'])
+        yield GaugeMetricFamily('disk_usage_percent', 'Disk usage percentage', value=sample['disk'])
+
 class PipelineMonitor:
     """Monitoring system for the bike share ELT pipeline."""
     
@@ -33,29 +79,18 @@ class PipelineMonitor:
         # Create monitoring directory
         os.makedirs('pipeline_monitoring', exist_ok=True)
         
-        # Initialize Snowflake connection parameters
-        self.conn_params = {
-            'account': os.getenv('SNOWFLAKE_ACCOUNT'),
-            'user': os.getenv('SNOWFLAKE_USER'),
-            'password': os.getenv('SNOWFLAKE_PASSWORD'),
-            'database': os.getenv('SNOWFLAKE_DATABASE'),
-            'schema': os.getenv('SNOWFLAKE_SCHEMA'),
-            'warehouse': os.getenv('SNOWFLAKE_WAREHOUSE'),
-            'role': os.getenv('SNOWFLAKE_ROLE')
-        }
-        
-        # Initialize Prometheus metrics
+        # Initialize Prometheus metrics (DAG run success/failure counters are exported by the
+        # bikeshare_listener Airflow plugin from the scheduler)
         self.metrics = {
             'pipeline_duration': Histogram('pipeline_duration_seconds', 'Pipeline execution duration'),
             'records_processed': Counter('records_processed_total', 'Total records processed'),
-            'pipeline_success': Counter('pipeline_success_total', 'Successful pipeline runs'),
-            'pipeline_failure': Counter('pipeline_failure_total', 'Failed pipeline runs'),
-            'data_freshness': Gauge('data_freshness_hours', 'Hours since last data update'),
-            'cpu_usage': Gauge('cpu_usage_percent', 'CPU usage percentage'),
-            'memory_usage': Gauge('memory_usage_percent', 'Memory usage percentage'),
-            'disk_usage': Gauge('disk_usage_percent', 'Disk usage percentage')
+            'data_freshness': Gauge('data_freshness_hours', 'Hours since last data update')
         }
         
+        # System resource gauges are computed on scrape by a custom collector
+        self.system = SystemResourceCollector()
+        REGISTRY.register(self.system)
+        
         # Initialize alert settings
         self.alert_settings = {
             'slack_webhook': os.getenv('SLACK_WEBHOOK_URL', ''),
@@ -65,137 +100,138 @@ class PipelineMonitor:
                 'cpu_usage': 80,       # Alert if CPU usage > 80%
                 'memory_usage': 80,    # Alert if memory usage > 80%
                 'disk_usage': 80       # Alert if disk usage > 80%
-            }
+            },
+            'cooldown_seconds': 900    # Repeat an identical alert at most every 15 minutes
         }
+        
+        # (label, alert key, threshold) per resource, in the order _check_resource_thresholds receives usages
+        self._threshold_pairs = tuple(
+            (resource.upper(), f'{resource}_high', float(self.alert_settings['thresholds'][f'{resource}_usage']))
+            for resource in ('cpu', 'memory', 'disk')
+        )
+        
+        # Alerts are queued and delivered by a background task over reused Slack/SMTP connections
+        # (the queue is created inside the event loop by start_monitoring)
+        self._alert_queue = None
+        self._http = requests.Session()
+        self._smtp = None
+        
+        # Last send time per alert key, so sustained conditions do not flood Slack and email
+        self._alert_sent_at = {}
     
     def start_prometheus_server(self, port: int = 8000):
         """Start Prometheus metrics server."""
         start_http_server(port)
         logging.info(f"✅ Prometheus metrics server started on port {port}")
     
-    def monitor_system_resources(self):
-        """Monitor system resource usage."""
+    async def check_resource_alerts(self):
+        """Alert on system resource usage, reusing the last scrape's sample when it is recent."""
         while True:
             try:
-                # CPU usage
-                cpu_percent = psutil.cpu_percent(interval=1)
-                self.metrics['cpu_usage'].set(cpu_percent)
-                
-                # Memory usage
-                memory = psutil.virtual_memory()
-                self.metrics['memory_usage'].set(memory.percent)
-                
-                # Disk usage
-                disk = psutil.disk_usage('/')
-                self.metrics['disk_usage'].set(disk.percent)
-                
-                # Check thresholds and alert if needed
-                self._check_resource_thresholds({
-                    'cpu': cpu_percent,
-                    'memory': memory.percent,
-                    'disk': disk.percent
-                })
-                
-                time.sleep(60)  # Update every minute
+                sample = self.system.latest(max_age=60)
+                self._check_resource_thresholds(sample['cpu'], sample['memory'], sample['disk'])
+                await asyncio.sleep(60)  # Check every minute
                 
             except Exception as e:
-                logging.error(f"❌ Error monitoring system resources: {e}")
-                time.sleep(60)  # Wait before retrying
+                logging.error(f"❌ Error checking system resources: {e}")
+                await asyncio.sleep(60)  # Wait before retrying
     
-    def monitor_airflow_dags(self):
-        """Monitor Airflow DAG runs."""
-        session = Session()
-        
+    async def monitor_pipeline_metrics(self):
+        """Monitor data freshness and pipeline execution metrics with one query per cycle."""
         while True:
             try:
-                # Get recent DAG runs
-                recent_runs = session.query(DagRun).filter(
-                    DagRun.start_date >= datetime.now() - timedelta(hours=24)
-                ).all()
-                
-                for run in recent_runs:
-                    if run.state == 'success':
-                        self.metrics['pipeline_success'].inc()
-                    elif run.state == 'failed':
-                        self.metrics['pipeline_failure'].inc()
-                        self._send_alert(f"❌ DAG {run.dag_id} failed at {run.start_date}")
-                
-                time.sleep(300)  # Check every 5 minutes
+                # The connector is blocking end to end, so the whole round trip runs off the event loop
+                row = await asyncio.to_thread(self._query_pipeline_metrics)
+                total_records, earliest_date, latest_date, last_altered = row
                 
-            except Exception as e:
-                logging.error(f"❌ Error monitoring Airflow DAGs: {e}")
-                time.sleep(300)
-    
-    def monitor_data_freshness(self):
-        """Monitor data freshness in Snowflake."""
-        while True:
-            try:
-                conn = snowflake.connector.connect(**self.conn_params)
-                
-                # Get latest data timestamp
-                latest_data = pd.read_sql("""
-                    SELECT MAX(date) as latest_date
-                    FROM fct_hourly_rentals
-                """, conn)
-                
-                if not latest_data.empty:
-                    latest_date = latest_data['latest_date'].iloc[0]
-                    hours_since_update = (datetime.now() - latest_date).total_seconds() / 3600
-                    
+                if total_records:
+                    hours_since_update = (datetime.utcnow() - last_altered).total_seconds() / 3600
                     self.metrics['data_freshness'].set(hours_since_update)
                     
                     if hours_since_update > self.alert_settings['thresholds']['data_freshness']:
-                        self._send_alert(f"⚠️ Data is {hours_since_update:.1f} hours old")
-                
-                conn.close()
-                time.sleep(3600)  # Check every hour
-                
-            except Exception as e:
-                logging.error(f"❌ Error monitoring data freshness: {e}")
-                time.sleep(3600)
-    
-    def monitor_pipeline_metrics(self):
-        """Monitor pipeline execution metrics."""
-        while True:
-            try:
-                conn = snowflake.connector.connect(**self.conn_params)
-                
-                # Get pipeline execution metrics
-                metrics = pd.read_sql("""
-                    SELECT 
-                        COUNT(*) as total_records,
-                        MIN(date) as earliest_date,
-                        MAX(date) as latest_date
-                    FROM fct_hourly_rentals
-                """, conn)
-                
-                if not metrics.empty:
-                    self.metrics['records_processed'].inc(metrics['total_records'].iloc[0])
+                        self._send_alert('freshness', f"⚠️ Data is {hours_since_update:.1f} hours old")
+                    
+                    self.metrics['records_processed'].inc(total_records)
                     
                     # Calculate pipeline duration
-                    duration = (metrics['latest_date'].iloc[0] - metrics['earliest_date'].iloc[0]).total_seconds()
+                    duration = (latest_date - earliest_date).total_seconds()
                     self.metrics['pipeline_duration'].observe(duration)
                 
-                conn.close()
-                time.sleep(300)  # Update every 5 minutes
+                await asyncio.sleep(300)  # Update every 5 minutes
                 
             except Exception as e:
                 logging.error(f"❌ Error monitoring pipeline metrics: {e}")
-                time.sleep(300)
+                await asyncio.sleep(300)
+    
+    def _query_pipeline_metrics(self):
+        """Run the combined freshness/metrics query on this thread's pooled connection."""
+        # Freshness and execution metrics come from the same round trip. Freshness is the
+        # table's LAST_ALTERED metadata (in UTC) rather than a MAX(date) scan
+        sql = """
+            SELECT 
+                COUNT(*) as total_records,
+                MIN(date) as earliest_date,
+                MAX(date) as latest_date,
+                (
+                    SELECT CONVERT_TIMEZONE('UTC', last_altered)::TIMESTAMP_NTZ
+                    FROM information_schema.tables
+                    WHERE table_schema = CURRENT_SCHEMA()
+                      AND table_name = 'FCT_HOURLY_RENTALS'
+                ) as last_altered
+            FROM fct_hourly_rentals
+        """
+        # A broken or expired session is not marked closed, so drop it and retry once on a fresh connection
+        try:
+            return get_conn().cursor().execute(sql).fetchone()
+        except (OperationalError, ProgrammingError) as e:
+            logging.warning(f"⚠️ Snowflake session error, reconnecting: {e}")
+            invalidate_conn()
+            return get_conn().cursor().execute(sql).fetchone()
     
-    def _check_resource_thresholds(self, resources: Dict[str, float]):
+    def _check_resource_thresholds(self, cpu: float, memory: float, disk: float):
         """Check if resource usage exceeds thresholds."""
-        for resource, usage in resources.items():
-            threshold = self.alert_settings['thresholds'][f'{resource}_usage']
+        for (label, key, threshold), usage in zip(self._threshold_pairs, (cpu, memory, disk)):
             if usage > threshold:
-                self._send_alert(f"⚠️ {resource.upper()} usage is {usage}% (threshold: {threshold}%)")
+                self._send_alert(key, f"⚠️ {label} usage is {usage}% (threshold: {threshold:g}%)")
+    
+    def _send_alert(self, key: str, message: str):
+        """Queue an alert for delivery without blocking the calling monitor, unless the same key fired recently."""
+        now = time.monotonic()
+        if now - self._alert_sent_at.get(key, float('-inf')) < self.alert_settings['cooldown_seconds']:
+            return
+        self._alert_sent_at[key] = now
+        self._alert_queue.put_nowait(message)
     
-    def _send_alert(self, message: str):
+    async def _alert_worker(self):
+        """Deliver queued alerts through configured channels."""
+        while True:
+            message = await self._alert_queue.get()
+            # Slack and SMTP clients are blocking, so delivery runs off the event loop
+            await asyncio.to_thread(self._deliver_alert, message)
+            self._alert_queue.task_done()
+    
+    def _smtp_connection(self) -> smtplib.SMTP:
+        """Return the authenticated SMTP session, reconnecting if it has dropped."""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+        
+        server = smtplib.SMTP('smtp.gmail.com', 587)
+        server.starttls()
+        server.login(os.getenv('ALERT_EMAIL_USER'), os.getenv('ALERT_EMAIL_PASSWORD'))
+        self._smtp = server
+        return server
+    
+    def _deliver_alert(self, message: str):
         """Send alert through configured channels."""
         if self.alert_settings['slack_webhook']:
             try:
                 payload = {'text': message}
-                response = requests.post(self.alert_settings['slack_webhook'], json=payload)
+                response = self._http.post(self.alert_settings['slack_webhook'], json=payload)
                 response.raise_for_status()
                 logging.info("✅ Slack alert sent successfully")
             except Exception as e:
@@ -203,10 +239,6 @@ class PipelineMonitor:
         
         if self.alert_settings['email_recipients']:
             try:
-                import smtplib
-                from email.mime.text import MIMEText
-                from email.mime.multipart import MIMEMultipart
-                
                 msg = MIMEMultipart()
                 msg['Subject'] = 'Pipeline Monitoring Alert'
                 msg['From'] = os.getenv('ALERT_EMAIL_SENDER', 'alerts@bikeshare.com')
@@ -214,39 +246,40 @@ class PipelineMonitor:
                 
                 msg.attach(MIMEText(message, 'plain'))
                 
-                with smtplib.SMTP('smtp.gmail.com', 587) as server:
-                    server.starttls()
-                    server.login(os.getenv('ALERT_EMAIL_USER'), os.getenv('ALERT_EMAIL_PASSWORD'))
-                    server.send_message(msg)
+                self._smtp_connection().send_message(msg)
                 
                 logging.info("✅ Email alert sent successfully")
             except Exception as e:
+                self._smtp = None
                 logging.error(f"❌ Failed to send email alert: {e}")
     
+    def _snapshot(self) -> Dict[str, float]:
+        """Current value of every registered sample, read in one pass over the Prometheus registry."""
+        return {sample.name: sample.value for family in REGISTRY.collect() for sample in family.samples}
+    
     def generate_monitoring_report(self):
         """Generate monitoring report."""
         try:
+            snapshot = self._snapshot()
             report = {
                 'timestamp': datetime.now().isoformat(),
                 'system_metrics': {
-                    'cpu_usage': psutil.cpu_percent(),
-                    'memory_usage': psutil.virtual_memory().percent,
-                    'disk_usage': psutil.disk_usage('/').percent
+                    'cpu_usage': snapshot['cpu_usage_percent'],
+                    'memory_usage': snapshot['memory_usage_percent'],
+                    'disk_usage': snapshot['disk_usage_percent']
                 },
                 'pipeline_metrics': {
-                    'records_processed': self.metrics['records_processed']._value.get(),
-                    'pipeline_success': self.metrics['pipeline_success']._value.get(),
-                    'pipeline_failure': self.metrics['pipeline_failure']._value.get(),
-                    'data_freshness': self.metrics['data_freshness']._value.get()
+                    'records_processed': snapshot['records_processed_total'],
+                    'data_freshness': snapshot['data_freshness_hours']
                 }
             }
             
-            # Save report
-            report_file = f'pipeline_monitoring/monitoring_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-            with open(report_file, 'w') as f:
-                json.dump(report, f, indent=2)
+            # Append to a single NDJSON log instead of writing one file per report
+            report_file = 'pipeline_monitoring/monitor.ndjson'
+            with open(report_file, 'ab') as f:
+                f.write(orjson.dumps(report) + b'\n')
             
-            logging.info(f"✅ Monitoring report generated: {report_file}")
+            logging.info(f"✅ Monitoring report appended to {report_file}")
             return report
             
         except Exception as e:
@@ -260,26 +293,30 @@ class PipelineMonitor:
         # Start Prometheus server
         self.start_prometheus_server()
         
-        # Start monitoring threads
-        threads = [
-            threading.Thread(target=self.monitor_system_resources, daemon=True),
-            threading.Thread(target=self.monitor_airflow_dags, daemon=True),
-            threading.Thread(target=self.monitor_data_freshness, daemon=True),
-            threading.Thread(target=self.monitor_pipeline_metrics, daemon=True)
-        ]
-        
-        for thread in threads:
-            thread.start()
-        
-        logging.info("✅ All monitoring processes started")
-        
         try:
-            # Keep main thread alive
-            while True:
-                time.sleep(3600)  # Generate report every hour
-                self.generate_monitoring_report()
+            asyncio.run(self._run())
         except KeyboardInterrupt:
             logging.info("👋 Stopping pipeline monitoring...")
+    
+    async def _run(self):
+        """Run every monitor as a task on a single event loop."""
+        self._alert_queue = asyncio.Queue()
+        
+        tasks = [
+            self._alert_worker(),
+            self.check_resource_alerts(),
+            self.monitor_pipeline_metrics(),
+            self._report_loop()
+        ]
+        
+        logging.info("✅ All monitoring processes started")
+        await asyncio.gather(*tasks)
+    
+    async def _report_loop(self):
+        """Generate a monitoring report every hour."""
+        while True:
+            await asyncio.sleep(3600)
+            self.generate_monitoring_report()
 
 if __name__ == "__main__":
     monitor = PipelineMonitor()
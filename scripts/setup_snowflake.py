@@ -2,6 +2,7 @@
 
 import snowflake.connector
 import os
+from io import StringIO
 
 def setup_snowflake():
     # Get Snowflake connection parameters from environment variables
@@ -17,61 +18,59 @@ def setup_snowflake():
     cursor = conn.cursor()
     
     try:
-        print("🏗️  Creating database...")
-        cursor.execute("CREATE DATABASE IF NOT EXISTS BIKESHARE_DB")
+        # The DDL lives in one script; the connector still runs it statement by statement on this
+        # session (so the USE statements carry over), reporting each one as it completes
+        print("🏗️  Creating database, schemas, warehouse, raw table, file format and stage...")
+        setup_script = StringIO("""
+        -- Database and schemas
+        CREATE DATABASE IF NOT EXISTS BIKESHARE_DB;
+        CREATE SCHEMA IF NOT EXISTS BIKESHARE_DB.RAW;
+        CREATE SCHEMA IF NOT EXISTS BIKESHARE_DB.ANALYTICS;
         
-        print("🏗️  Creating schemas...")
-        cursor.execute("CREATE SCHEMA IF NOT EXISTS BIKESHARE_DB.RAW")
-        cursor.execute("CREATE SCHEMA IF NOT EXISTS BIKESHARE_DB.ANALYTICS")
-        
-        print("🏗️  Creating warehouse...")
-        cursor.execute("""
+        -- Warehouse
         CREATE WAREHOUSE IF NOT EXISTS BIKESHARE_WH
             WITH 
             WAREHOUSE_SIZE = 'X-SMALL'
             AUTO_SUSPEND = 60
             AUTO_RESUME = TRUE
-            INITIALLY_SUSPENDED = TRUE
-        """)
+            INITIALLY_SUSPENDED = TRUE;
         
-        print("🔐 Granting permissions to SYSADMIN...")
-        cursor.execute("GRANT USAGE ON WAREHOUSE BIKESHARE_WH TO ROLE SYSADMIN")
-        cursor.execute("GRANT ALL ON DATABASE BIKESHARE_DB TO ROLE SYSADMIN")
-        cursor.execute("GRANT ALL ON SCHEMA BIKESHARE_DB.RAW TO ROLE SYSADMIN")
-        cursor.execute("GRANT ALL ON SCHEMA BIKESHARE_DB.ANALYTICS TO ROLE SYSADMIN")
+        -- Permissions for SYSADMIN
+        GRANT USAGE ON WAREHOUSE BIKESHARE_WH TO ROLE SYSADMIN;
+        GRANT ALL ON DATABASE BIKESHARE_DB TO ROLE SYSADMIN;
+        GRANT ALL ON SCHEMA BIKESHARE_DB.RAW TO ROLE SYSADMIN;
+        GRANT ALL ON SCHEMA BIKESHARE_DB.ANALYTICS TO ROLE SYSADMIN;
         
-        print("🔄 Switching to SYSADMIN role...")
-        cursor.execute("USE ROLE SYSADMIN")
-        cursor.execute("USE WAREHOUSE BIKESHARE_WH")
-        cursor.execute("USE DATABASE BIKESHARE_DB")
-        cursor.execute("USE SCHEMA RAW")
+        -- Switch to SYSADMIN for object creation
+        USE ROLE SYSADMIN;
+        USE WAREHOUSE BIKESHARE_WH;
+        USE DATABASE BIKESHARE_DB;
+        USE SCHEMA RAW;
         
-        print("📊 Creating raw table...")
-        cursor.execute("""
+        -- Raw table
         CREATE TABLE IF NOT EXISTS RAW.BIKESHARE_RAW (
-            instant INT,
-            dteday DATE,
-            season INT,
-            yr INT,
-            mnth INT,
-            hr INT,
-            holiday INT,
-            weekday INT,
-            workingday INT,
-            weathersit INT,
-            temp FLOAT,
-            atemp FLOAT,
-            hum FLOAT,
-            windspeed FLOAT,
-            casual INT,
-            registered INT,
-            cnt INT,
+            instant INT NOT NULL,
+            dteday DATE NOT NULL,
+            season INT NOT NULL,
+            yr INT NOT NULL,
+            mnth INT NOT NULL,
+            hr INT NOT NULL,
+            holiday INT NOT NULL,
+            weekday INT NOT NULL,
+            workingday INT NOT NULL,
+            weathersit INT NOT NULL,
+            temp FLOAT NOT NULL,
+            atemp FLOAT NOT NULL,
+            hum FLOAT NOT NULL,
+            windspeed FLOAT NOT NULL,
+            casual INT NOT NULL,
+            registered INT NOT NULL,
+            cnt INT NOT NULL,
             loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
         )
-        """)
+        DATA_RETENTION_TIME_IN_DAYS = 1;
         
-        print("📁 Creating file format...")
-        cursor.execute("""
+        -- File format
         CREATE OR REPLACE FILE FORMAT CSV_FORMAT
             TYPE = 'CSV'
             FIELD_DELIMITER = ','
@@ -84,14 +83,14 @@ def setup_snowflake():
             ESCAPE_UNENCLOSED_FIELD = '\\134'
             DATE_FORMAT = 'YYYY-MM-DD'
             TIMESTAMP_FORMAT = 'YYYY-MM-DD HH24:MI:SS'
-            NULL_IF = ('\\\\N', 'NULL', 'null', '', 'N/A')
-        """)
+            NULL_IF = ('\\\\N', 'NULL', 'null', '', 'N/A');
         
-        print("🎯 Creating stage...")
-        cursor.execute("""
+        -- Stage
         CREATE OR REPLACE STAGE BIKESHARE_STAGE
-            FILE_FORMAT = CSV_FORMAT
+            FILE_FORMAT = CSV_FORMAT;
         """)
+        for statement_cursor in conn.execute_stream(setup_script, remove_comments=True):
+            print(f"   ✓ {' '.join(statement_cursor.query.split()[:6])}")
         
         print("✅ Verifying setup...")
         cursor.execute("SELECT CURRENT_DATABASE(), CURRENT_SCHEMA(), CURRENT_WAREHOUSE(), CURRENT_ROLE()")
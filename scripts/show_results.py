@@ -2,6 +2,7 @@
 
 import snowflake.connector
 import pandas as pd
+import json
 import os
 from datetime import datetime
 
@@ -24,95 +25,53 @@ def show_pipeline_results():
     cursor = conn.cursor()
     
     try:
-        print("\n🏔️ SNOWFLAKE RESULTS SUMMARY")
-        print("=" * 60)
+        # Every summary is precomputed by the results_summary dbt model; repeat runs of this
+        # deterministic query are answered from Snowflake's result cache
+        cursor.execute("ALTER SESSION SET USE_CACHED_RESULT = TRUE")
+        cursor.execute("SELECT section, payload FROM results_summary ORDER BY section_order")
+        sections = {section: json.loads(payload) for section, payload in cursor.fetchall()}
         
-        # Check raw data
-        cursor.execute("SELECT COUNT(*) FROM BIKESHARE_RAW")
-        raw_count = cursor.fetchone()[0]
-        print(f"📊 Raw data records: {raw_count:,}")
+        def show(section, columns, headers, formatters=None):
+            """Print a summary section as an aligned table."""
+            df = pd.DataFrame(sections[section], columns=columns)
+            df.columns = headers
+            print(df.to_string(index=False, formatters=formatters))
         
-        # Check transformed tables
-        cursor.execute("SELECT COUNT(*) FROM dim_weather")
-        weather_count = cursor.fetchone()[0]
-        print(f"🌤️ Weather dimension records: {weather_count:,}")
+        print("\n🏔️ SNOWFLAKE RESULTS SUMMARY")
+        print("=" * 60)
         
-        cursor.execute("SELECT COUNT(*) FROM fct_hourly_rentals")
-        facts_count = cursor.fetchone()[0]
-        print(f"🚴 Hourly rentals records: {facts_count:,}")
+        counts = sections['record_counts'][0]
+        print(f"📊 Raw data records: {counts['raw_records']:,}")
+        print(f"🌤️ Weather dimension records: {counts['weather_records']:,}")
+        print(f"🚴 Hourly rentals records: {counts['fact_records']:,}")
         
         print("\n🌤️ WEATHER CONDITIONS:")
         print("-" * 50)
-        cursor.execute("""
-            SELECT weather_id, weather_desc, 
-                   ROUND(avg_temp_celsius, 2) as avg_temp,
-                   ROUND(avg_humidity_percent, 1) as avg_humidity
-            FROM dim_weather 
-            ORDER BY weather_id
-        """)
-        for row in cursor.fetchall():
-            print(f"  {row[0]}: {row[1]} (Temp: {row[2]}°C, Humidity: {row[3]}%)")
+        show('weather_conditions', ['weather_id', 'weather_desc', 'avg_temp', 'avg_humidity'],
+             ['Id', 'Weather', 'Temp (°C)', 'Humidity (%)'])
         
         print("\n📈 TOP 10 BUSIEST HOURS:")
         print("-" * 70)
-        cursor.execute("""
-            SELECT date, hour, season_name, time_of_day, total_rentals
-            FROM fct_hourly_rentals 
-            ORDER BY total_rentals DESC 
-            LIMIT 10
-        """)
-        print("  Date       | Hour | Season | Time Period    | Rentals")
-        print("  -----------|------|--------|----------------|--------")
-        for row in cursor.fetchall():
-            print(f"  {row[0]} | {row[1]:4d} | {row[2]:6s} | {row[3]:14s} | {row[4]:7d}")
+        show('busiest_hours', ['date', 'hour', 'season_name', 'time_of_day', 'total_rentals'],
+             ['Date', 'Hour', 'Season', 'Time Period', 'Rentals'])
         
         print("\n📊 RENTAL PATTERNS BY SEASON:")
         print("-" * 50)
-        cursor.execute("""
-            SELECT season_name, 
-                   COUNT(*) as total_hours,
-                   AVG(total_rentals) as avg_rentals,
-                   SUM(total_rentals) as total_rentals
-            FROM fct_hourly_rentals 
-            GROUP BY season_name 
-            ORDER BY avg_rentals DESC
-        """)
-        print("  Season | Hours | Avg/Hour | Total Rentals")
-        print("  -------|-------|----------|---------------")
-        for row in cursor.fetchall():
-            print(f"  {row[0]:6s} | {row[1]:5d} | {row[2]:8.1f} | {row[3]:13,d}")
+        show('seasonal_patterns', ['season_name', 'total_hours', 'avg_rentals', 'total_rentals'],
+             ['Season', 'Hours', 'Avg/Hour', 'Total Rentals'],
+             formatters={'Avg/Hour': '{:.1f}'.format, 'Total Rentals': '{:,.0f}'.format})
         
         print("\n🌧️ WEATHER IMPACT ON RENTALS:")
         print("-" * 50)
-        cursor.execute("""
-            SELECT w.weather_desc,
-                   COUNT(*) as hours,
-                   AVG(f.total_rentals) as avg_rentals
-            FROM fct_hourly_rentals f
-            JOIN dim_weather w ON f.weather_id = w.weather_id
-            GROUP BY w.weather_desc, w.weather_id
-            ORDER BY avg_rentals DESC
-        """)
-        print("  Weather Condition     | Hours | Avg Rentals/Hour")
-        print("  ----------------------|-------|------------------")
-        for row in cursor.fetchall():
-            print(f"  {row[0]:20s} | {row[1]:5d} | {row[2]:16.1f}")
+        show('weather_impact', ['weather_desc', 'hours', 'avg_rentals'],
+             ['Weather Condition', 'Hours', 'Avg Rentals/Hour'],
+             formatters={'Avg Rentals/Hour': '{:.1f}'.format})
         
         print("\n⏰ PEAK HOURS ANALYSIS:")
         print("-" * 40)
-        cursor.execute("""
-            SELECT hour, 
-                   AVG(total_rentals) as avg_rentals,
-                   time_of_day
-            FROM fct_hourly_rentals 
-            GROUP BY hour, time_of_day
-            ORDER BY avg_rentals DESC 
-            LIMIT 8
-        """)
-        print("  Hour | Time Period    | Avg Rentals")
-        print("  -----|----------------|------------")
-        for row in cursor.fetchall():
-            print(f"  {row[0]:4d} | {row[2]:14s} | {row[1]:11.1f}")
+        show('peak_hours', ['hour', 'time_of_day', 'avg_rentals'],
+             ['Hour', 'Time Period', 'Avg Rentals'],
+             formatters={'Avg Rentals': '{:.1f}'.format})
         
         print(f"\n✅ Pipeline Results Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
@@ -0,0 +1,27 @@
+-- Migration: enforce NOT NULL on BIKESHARE_RAW for tables created before the constraints were added
+-- Snowflake does not support CHECK constraints, so range rules are asserted by the DAG's verify_snowflake_load task
+USE WAREHOUSE BIKESHARE_WH;
+USE DATABASE BIKESHARE_DB;
+USE SCHEMA RAW;
+
+ALTER TABLE BIKESHARE_RAW ALTER
+    instant SET NOT NULL,
+    dteday SET NOT NULL,
+    season SET NOT NULL,
+    yr SET NOT NULL,
+    mnth SET NOT NULL,
+    hr SET NOT NULL,
+    holiday SET NOT NULL,
+    weekday SET NOT NULL,
+    workingday SET NOT NULL,
+    weathersit SET NOT NULL,
+    temp SET NOT NULL,
+    atemp SET NOT NULL,
+    hum SET NOT NULL,
+    windspeed SET NOT NULL,
+    casual SET NOT NULL,
+    registered SET NOT NULL,
+    cnt SET NOT NULL;
+
+-- Verify constraints
+DESCRIBE TABLE BIKESHARE_RAW;
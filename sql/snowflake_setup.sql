@@ -25,25 +25,26 @@ USE SCHEMA RAW;
 
 -- Create raw table for bike share data
 CREATE TABLE IF NOT EXISTS RAW.BIKESHARE_RAW (
-    instant INT,
-    dteday DATE,
-    season INT,
-    yr INT,
-    mnth INT,
-    hr INT,
-    holiday INT,
-    weekday INT,
-    workingday INT,
-    weathersit INT,
-    temp FLOAT,
-    atemp FLOAT,
-    hum FLOAT,
-    windspeed FLOAT,
-    casual INT,
-    registered INT,
-    cnt INT,
+    instant INT NOT NULL,
+    dteday DATE NOT NULL,
+    season INT NOT NULL,
+    yr INT NOT NULL,
+    mnth INT NOT NULL,
+    hr INT NOT NULL,
+    holiday INT NOT NULL,
+    weekday INT NOT NULL,
+    workingday INT NOT NULL,
+    weathersit INT NOT NULL,
+    temp FLOAT NOT NULL,
+    atemp FLOAT NOT NULL,
+    hum FLOAT NOT NULL,
+    windspeed FLOAT NOT NULL,
+    casual INT NOT NULL,
+    registered INT NOT NULL,
+    cnt INT NOT NULL,
     loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP()
-);
+)
+DATA_RETENTION_TIME_IN_DAYS = 1;
 
 -- Create file format for CSV loading
 CREATE OR REPLACE FILE FORMAT CSV_FORMAT
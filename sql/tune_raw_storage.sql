@@ -0,0 +1,10 @@
+-- Migration: storage settings for BIKESHARE_RAW tables created before they were added to the setup DDL
+USE WAREHOUSE BIKESHARE_WH;
+USE DATABASE BIKESHARE_DB;
+USE SCHEMA RAW;
+
+-- Time Travel beyond a day is not needed for a reloadable raw table
+ALTER TABLE BIKESHARE_RAW SET DATA_RETENTION_TIME_IN_DAYS = 1;
+
+-- Verify settings
+SHOW TABLES LIKE 'BIKESHARE_RAW';